@@ -11,6 +11,13 @@ load_dotenv()
 # Environment configuration
 ENVIRONMENT = os.getenv('KAFKA_ENV', 'local')  # 'local' or 'aws'
 
+# Message wire format shared by producer and consumer
+MESSAGE_FORMATS = ('json', 'msgpack', 'avro')
+MESSAGE_FORMAT = os.getenv('KAFKA_MESSAGE_FORMAT', 'json')  # 'json', 'msgpack' or 'avro'
+
+# Schema Registry (only used when KAFKA_MESSAGE_FORMAT=avro)
+SCHEMA_REGISTRY_URL = os.getenv('SCHEMA_REGISTRY_URL', 'http://localhost:8081')
+
 # Local Docker Kafka configuration
 # Local Docker Kafka configuration
 LOCAL_CONFIG = {
@@ -30,15 +37,48 @@ AWS_CONFIG = {
     'auto.offset.reset': 'earliest'
 }
 
+# Producer-only settings, layered on top of the environment config
+# Batch many small messages into each broker request for throughput
+PRODUCER_CONFIG = {
+    'linger.ms': 20,
+    'batch.num.messages': 10000,
+    'queue.buffering.max.kbytes': 1048576,
+    'compression.type': 'lz4',
+    'acks': '1',
+    'enable.idempotence': False
+}
+
+# Resolved once at import - environment variables don't change at runtime
+_KAFKA_CONFIG = AWS_CONFIG if ENVIRONMENT.lower() == 'aws' else LOCAL_CONFIG
+_PRODUCER_CONFIG = {**_KAFKA_CONFIG, **PRODUCER_CONFIG}
+_MESSAGE_FORMAT = MESSAGE_FORMAT.lower()
+
+if _MESSAGE_FORMAT not in MESSAGE_FORMATS:
+    raise ValueError(
+        f"Unknown KAFKA_MESSAGE_FORMAT '{MESSAGE_FORMAT}' "
+        f"(expected one of: {', '.join(MESSAGE_FORMATS)})"
+    )
+
 def get_kafka_config():
     """
     Returns Kafka configuration based on environment
     """
-    if ENVIRONMENT.lower() == 'aws':
-        return AWS_CONFIG
-    else:
-        return LOCAL_CONFIG
+    return _KAFKA_CONFIG
+
+def get_producer_config():
+    """
+    Returns Kafka configuration for producers (environment config + producer settings)
+    """
+    return _PRODUCER_CONFIG
 
 def get_environment():
     """Returns current environment"""
     return ENVIRONMENT
+
+def get_message_format():
+    """Returns the message wire format ('json', 'msgpack' or 'avro')"""
+    return _MESSAGE_FORMAT
+
+def get_schema_registry_config():
+    """Returns Schema Registry client configuration"""
+    return {'url': SCHEMA_REGISTRY_URL}
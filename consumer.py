@@ -3,34 +3,213 @@ Kafka Consumer CLI Application
 Consumes messages from a specified Kafka topic
 """
 import sys
-import json
+import time
+import queue
+import threading
+import orjson
+import msgpack
 import logging
-from confluent_kafka import Consumer, KafkaError
-from config import get_kafka_config, get_environment
+from confluent_kafka import Consumer, KafkaError, KafkaException, TopicPartition
+from confluent_kafka.schema_registry import SchemaRegistryClient
+from confluent_kafka.schema_registry.avro import AvroDeserializer
+from confluent_kafka.schema_registry.error import SchemaRegistryError
+from requests.exceptions import RequestException
+from confluent_kafka.serialization import SerializationContext, MessageField, SerializationError
+from config import get_kafka_config, get_environment, get_message_format, get_schema_registry_config
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def consume_messages(topic_name):
+# Maximum number of messages returned by a single consume() call
+# Kept small enough that a batch is always processed well within max.poll.interval.ms
+CONSUME_BATCH_SIZE = 500
+
+# Number of fetched batches that can wait for processing
+# When the queue is full the fetch thread blocks, which bounds memory use
+FETCH_QUEUE_SIZE = 4
+
+# The consumer leaves the group if consume() isn't called within this interval
+MAX_POLL_INTERVAL_MS = 300000
+
+# Print a progress line every N messages when not running with --verbose
+SUMMARY_INTERVAL = 1000
+
+SEPARATOR = "-" * 60
+
+# Seconds to wait before contacting Schema Registry again after it was unreachable
+SCHEMA_REGISTRY_RETRY_SECONDS = 30
+
+def create_decoder(message_format):
+    """
+    Create a decoder for message payloads produced by producer.py
+    
+    Args:
+        message_format (str): Wire format ('json', 'msgpack' or 'avro')
+    
+    Returns:
+        callable: decode(value, topic) returning a dict of message fields,
+        or None if the payload is not structured
+    """
+    if message_format == 'avro':
+        # Writer schemas are fetched from Schema Registry by the ID in each message
+        avro_deserializer = AvroDeserializer(SchemaRegistryClient(get_schema_registry_config()))
+        # While Schema Registry is down, show messages as plain text instead of
+        # making a request per message, and retry after SCHEMA_REGISTRY_RETRY_SECONDS
+        registry_available = True
+        registry_retry_at = 0.0
+        
+        def parse(value, topic):
+            nonlocal registry_available, registry_retry_at
+            if not registry_available and time.monotonic() < registry_retry_at:
+                return None
+            try:
+                message_data = avro_deserializer(value, SerializationContext(topic, MessageField.VALUE))
+            except SchemaRegistryError:
+                # Unknown schema id - the payload isn't one of our Avro messages
+                return None
+            except (EOFError, IndexError):
+                # Valid header but truncated or corrupt body
+                return None
+            except RequestException as e:
+                if registry_available:
+                    logger.error(
+                        f'Schema Registry unreachable, showing messages as plain text '
+                        f'(retrying in {SCHEMA_REGISTRY_RETRY_SECONDS}s): {str(e)}'
+                    )
+                registry_available = False
+                registry_retry_at = time.monotonic() + SCHEMA_REGISTRY_RETRY_SECONDS
+                return None
+            if not registry_available:
+                logger.info('Schema Registry reachable again')
+                registry_available = True
+            return message_data
+    elif message_format == 'msgpack':
+        def parse(value, topic):
+            return msgpack.unpackb(value)
+    else:
+        def parse(value, topic):
+            return orjson.loads(value)
+    
+    def decode(value, topic):
+        try:
+            message_data = parse(value, topic)
+        except (ValueError, SerializationError):
+            # orjson.JSONDecodeError and msgpack unpack errors are both ValueErrors
+            return None
+        return message_data if isinstance(message_data, dict) else None
+    
+    return decode
+
+def fetch_batches(consumer, batches, stop_event):
+    """
+    Fetch message batches and hand them to the processing thread
+    
+    Runs on a background thread so consume() keeps librdkafka's prefetch queue
+    moving while the main thread formats and prints earlier batches.
+    
+    Args:
+        consumer (Consumer): Subscribed Kafka consumer
+        batches (queue.Queue): Queue that receives lists of messages
+        stop_event (threading.Event): Set to stop fetching
+    """
+    consume = consumer.consume
+    try:
+        while not stop_event.is_set():
+            # Fetch a batch of messages (timeout after 1 second)
+            # consume() returns a list, so the per-call overhead is paid once per batch
+            msgs = consume(num_messages=CONSUME_BATCH_SIZE, timeout=1.0)
+            if not msgs:
+                continue
+            
+            # Wait while the queue is full, but keep checking for shutdown
+            while not stop_event.is_set():
+                try:
+                    batches.put(msgs, timeout=1.0)
+                    break
+                except queue.Full:
+                    continue
+    except Exception as e:
+        logger.error(f'Error fetching messages: {str(e)}')
+
+def format_message(message_count, topic, partition, offset, value, decode):
+    """
+    Format a message for display, encoded as UTF-8 bytes for stdout
+    
+    Args:
+        message_count (int): Running message number
+        topic (str): Topic the message came from
+        partition (int): Partition the message came from
+        offset (int): Offset of the message
+        value (bytes): Raw message value
+        decode (callable): Payload decoder from create_decoder()
+    
+    Returns:
+        bytes: Multi-line display text ending with a separator line
+    """
+    message_data = decode(value, topic)
+    if message_data is not None:
+        get = message_data.get
+        timestamp, environment, content = get('timestamp', 'N/A'), get('environment', 'N/A'), get('message', 'N/A')
+        return (
+            f"📨 Message #{message_count}\n"
+            f"   Topic: {topic}\n"
+            f"   Partition: {partition}\n"
+            f"   Offset: {offset}\n"
+            f"   Timestamp: {timestamp}\n"
+            f"   Environment: {environment}\n"
+            f"   Content: {content}\n"
+            f"{SEPARATOR}\n"
+        ).encode('utf-8')
+    
+    # If not structured, show as plain text
+    # The raw payload is written as-is instead of being decoded and re-encoded
+    return b"".join((
+        (
+            f"📨 Message #{message_count}\n"
+            f"   Topic: {topic}\n"
+            f"   Partition: {partition}\n"
+            f"   Offset: {offset}\n"
+            f"   Content: "
+        ).encode('utf-8'),
+        value,
+        f"\n{SEPARATOR}\n".encode('utf-8')
+    ))
+
+def consume_messages(topic_name, verbose=False):
     """
     Consume messages from the specified Kafka topic
     
     Args:
         topic_name (str): Name of the Kafka topic to consume from
+        verbose (bool): Print every message instead of periodic summaries
     """
     try:
         # Get Kafka configuration
         kafka_config = get_kafka_config()
+        message_format = get_message_format()
+        decode = create_decoder(message_format)
         
         # Add consumer-specific configuration
         consumer_config = kafka_config.copy()
         consumer_config.update({
             'group.id': 'kafka-learn-consumer-group',
             'enable.auto.commit': True,
+            # Offsets are stored manually once a batch is processed; auto-commit flushes them
+            'enable.auto.offset.store': False,
             'auto.commit.interval.ms': 1000,
-            'session.timeout.ms': 30000,
-            'max.poll.interval.ms': 300000
+            # Heartbeats are sent by librdkafka's background thread; short timeouts
+            # let the group notice a dead consumer and rebalance quickly
+            'session.timeout.ms': 10000,
+            'heartbeat.interval.ms': 3000,
+            'max.poll.interval.ms': MAX_POLL_INTERVAL_MS,
+            # Fetch larger chunks per broker round-trip and prefetch into the local queue
+            'fetch.min.bytes': 65536,
+            'fetch.wait.max.ms': 100,
+            'fetch.max.bytes': 52428800,
+            'max.partition.fetch.bytes': 4194304,
+            'queued.min.messages': 100000,
+            'queued.max.messages.kbytes': 1048576
         })
         
         # Create consumer
@@ -38,58 +217,126 @@ def consume_messages(topic_name):
         
         logger.info(f'Starting consumer for topic: {topic_name}')
         logger.info(f'Environment: {get_environment()}')
+        logger.info(f'Message format: {message_format}')
         logger.info(f'Kafka config: {kafka_config}')
         
+        # Batches fetched on the background thread, waiting for processing
+        batches = queue.Queue(maxsize=FETCH_QUEUE_SIZE)
+        
+        def on_assign(consumer, partitions):
+            logger.info(f'Partitions assigned: {[p.partition for p in partitions]}')
+        
+        def on_revoke(consumer, partitions):
+            # Called on the fetch thread from inside consume(). Queued batches belong
+            # to partitions we no longer own and the new owner will read them again,
+            # so drop them instead of processing duplicates
+            dropped = 0
+            while True:
+                try:
+                    batches.get_nowait()
+                    dropped += 1
+                except queue.Empty:
+                    break
+            logger.info(f'Partitions revoked: {[p.partition for p in partitions]}')
+            if dropped:
+                logger.warning(f'Dropped {dropped} queued batches from revoked partitions')
+        
         # Subscribe to topic
-        consumer.subscribe([topic_name])
+        consumer.subscribe([topic_name], on_assign=on_assign, on_revoke=on_revoke)
         
         print(f"\n🚀 Consumer started! Listening to topic: '{topic_name}'")
         print("Press Ctrl+C to stop the consumer\n")
-        print("-" * 60)
+        if not verbose:
+            print(f"Printing a summary every {SUMMARY_INTERVAL} messages (use --verbose to show each message)")
+        print(SEPARATOR)
+        
+        # Fetch on a background thread so slow output never stalls consume()
+        stop_fetching = threading.Event()
+        fetcher = threading.Thread(
+            target=fetch_batches,
+            args=(consumer, batches, stop_fetching),
+            name='kafka-fetcher',
+            daemon=True
+        )
+        fetcher.start()
         
-        # Message consumption loop
+        # Message processing loop
         message_count = 0
         try:
             while True:
-                # Poll for messages (timeout after 1 second)
-                msg = consumer.poll(timeout=1.0)
-                
-                if msg is None:
-                    # No message received within timeout
+                try:
+                    msgs = batches.get(timeout=1.0)
+                except queue.Empty:
+                    if not fetcher.is_alive():
+                        raise RuntimeError('Fetch thread stopped unexpectedly')
                     continue
+                batch_started = time.monotonic()
+                
+                # Last processed offset per (topic, partition) in this batch
+                last_offsets = {}
+                # Display bytes for the whole batch, written to stdout in one call
+                output = []
+                batch_start_count = message_count
+                
+                for msg in msgs:
+                    # A regex subscription can match several topics, so read it per message
+                    topic = msg.topic()
+                    partition = msg.partition()
+                    offset = msg.offset()
                     
-                if msg.error():
-                    # Handle errors
-                    if msg.error().code() == KafkaError._PARTITION_EOF:
-                        # End of partition event - not an error
-                        logger.debug(f'End of partition reached for {msg.topic()} [{msg.partition()}]')
-                        continue
-                    else:
-                        logger.error(f'Consumer error: {msg.error()}')
+                    if msg.error():
+                        # Handle errors
+                        if msg.error().code() == KafkaError._PARTITION_EOF:
+                            # End of partition event - not an error
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug(f'End of partition reached for {topic} [{partition}]')
+                            continue
+                        else:
+                            logger.error(f'Consumer error: {msg.error()}')
+                            continue
+                    
+                    # Process the message
+                    message_count += 1
+                    if verbose:
+                        output.append(format_message(
+                            message_count, topic, partition, offset, msg.value(), decode
+                        ))
+                    
+                    last_offsets[(topic, partition)] = offset
+                
+                if last_offsets:
+                    # Store the next offset to read for each partition in the batch
+                    # The background auto-commit commits them every auto.commit.interval.ms
+                    try:
+                        consumer.store_offsets(offsets=[
+                            TopicPartition(t, p, o + 1) for (t, p), o in last_offsets.items()
+                        ])
+                    except KafkaException as e:
+                        if e.args[0].code() != KafkaError._STATE:
+                            raise
+                        # The batch was being processed when its partitions were revoked;
+                        # the new owner will consume these messages again
+                        logger.warning('Skipping batch from revoked partitions; offsets not stored')
+                        message_count = batch_start_count
                         continue
                 
-                # Process the message
-                message_count += 1
-                try:
-                    # Try to parse as JSON first
-                    message_data = json.loads(msg.value().decode('utf-8'))
-                    print(f"📨 Message #{message_count}")
-                    print(f"   Topic: {msg.topic()}")
-                    print(f"   Partition: {msg.partition()}")
-                    print(f"   Offset: {msg.offset()}")
-                    print(f"   Timestamp: {message_data.get('timestamp', 'N/A')}")
-                    print(f"   Environment: {message_data.get('environment', 'N/A')}")
-                    print(f"   Content: {message_data.get('message', 'N/A')}")
-                    print("-" * 60)
-                    
-                except json.JSONDecodeError:
-                    # If not JSON, print as plain text
-                    print(f"📨 Message #{message_count}")
-                    print(f"   Topic: {msg.topic()}")
-                    print(f"   Partition: {msg.partition()}")
-                    print(f"   Offset: {msg.offset()}")
-                    print(f"   Content: {msg.value().decode('utf-8')}")
-                    print("-" * 60)
+                if output:
+                    # Flush pending print() text first so output stays in order
+                    sys.stdout.flush()
+                    sys.stdout.buffer.write(b''.join(output))
+                    sys.stdout.buffer.flush()
+                elif message_count // SUMMARY_INTERVAL > batch_start_count // SUMMARY_INTERVAL:
+                    print(f"📊 Messages consumed: {message_count}")
+                
+                # Warn before slow processing gets this consumer kicked out of the group
+                # A blocked fetch thread only needs one free queue slot, so the gap between
+                # consume() calls is roughly one batch's processing time
+                batch_ms = (time.monotonic() - batch_started) * 1000
+                if batch_ms > MAX_POLL_INTERVAL_MS / 2:
+                    logger.warning(
+                        f'Processing {len(msgs)} messages took {batch_ms:.0f}ms '
+                        f'(max.poll.interval.ms is {MAX_POLL_INTERVAL_MS}); consider lowering CONSUME_BATCH_SIZE'
+                    )
                     
         except KeyboardInterrupt:
             print(f"\n\n🛑 Consumer stopped by user")
@@ -101,6 +348,11 @@ def consume_messages(topic_name):
         sys.exit(1)
         
     finally:
+        # Stop fetching before closing the consumer it uses
+        if 'fetcher' in locals():
+            stop_fetching.set()
+            fetcher.join()
+        
         # Close consumer
         if 'consumer' in locals():
             consumer.close()
@@ -110,15 +362,19 @@ def main():
     """
     Main function - handles command line arguments
     """
-    if len(sys.argv) != 2:
-        print("Usage: python consumer.py <topic_name>")
+    args = sys.argv[1:]
+    verbose = '--verbose' in args
+    args = [arg for arg in args if arg != '--verbose']
+    
+    if len(args) != 1:
+        print("Usage: python consumer.py <topic_name> [--verbose]")
         print("\nExample:")
         print("  python consumer.py payments")
-        print("  python consumer.py orders")
+        print("  python consumer.py orders --verbose")
         print("  python consumer.py logs")
         sys.exit(1)
     
-    topic_name = sys.argv[1]
+    topic_name = args[0]
     
     # Validate topic name
     if not topic_name or not topic_name.strip():
@@ -126,7 +382,7 @@ def main():
         sys.exit(1)
     
     # Start consuming messages
-    consume_messages(topic_name.strip())
+    consume_messages(topic_name.strip(), verbose)
 
 if __name__ == '__main__':
     main()
@@ -3,66 +3,98 @@
 Kafka Connection Diagnostic Script
 Helps identify the correct configuration for your Kafka setup
 """
-import socket
+import asyncio
 import ssl
+from concurrent.futures import ThreadPoolExecutor
 from confluent_kafka import Producer, Consumer, KafkaError
 import json
 
-def test_connection(host, port):
-    """Test basic TCP connection"""
+# Seconds to wait for each socket probe
+PROBE_TIMEOUT = 5
+
+def describe_error(e):
+    """Readable text for a probe failure (timeouts have an empty str())"""
+    if isinstance(e, asyncio.TimeoutError):
+        return f"timed out after {PROBE_TIMEOUT}s"
+    return str(e) or type(e).__name__
+
+async def test_connection(host, port):
+    """
+    Test basic TCP connection
+    
+    Returns:
+        (bool, str): Whether the connection worked, and the error text if not
+    """
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(5)
-        result = sock.connect_ex((host, port))
-        sock.close()
-        return result == 0
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=PROBE_TIMEOUT)
+        writer.close()
+        await writer.wait_closed()
+        return True, None
     except Exception as e:
-        print(f"Connection test failed: {e}")
-        return False
+        return False, describe_error(e)
 
-def test_ssl_connection(host, port):
-    """Test SSL connection"""
+async def test_ssl_connection(host, port):
+    """
+    Test SSL connection
+    
+    Returns:
+        (bool, str): Whether the connection worked, and the error text if not
+    """
     try:
         context = ssl.create_default_context()
         context.check_hostname = False
         context.verify_mode = ssl.CERT_NONE
         
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(5)
-        ssl_sock = context.wrap_socket(sock, server_hostname=host)
-        ssl_sock.connect((host, port))
-        ssl_sock.close()
-        return True
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=context, server_hostname=host),
+            timeout=PROBE_TIMEOUT
+        )
+        writer.close()
+        await writer.wait_closed()
+        return True, None
     except Exception as e:
-        print(f"SSL connection test failed: {e}")
-        return False
+        return False, describe_error(e)
+
+async def test_connections(host, port):
+    """Run the TCP and SSL probes concurrently"""
+    return await asyncio.gather(test_connection(host, port), test_ssl_connection(host, port))
 
 def test_kafka_config(config, config_name):
-    """Test Kafka configuration"""
-    print(f"\n🔍 Testing {config_name} configuration:")
-    print(f"   Config: {config}")
+    """
+    Test Kafka configuration
+    
+    Output is collected and returned rather than printed so that several
+    configurations can be probed in parallel without interleaving.
+    
+    Returns:
+        (bool, str): Whether the config works, and the report text
+    """
+    lines = [
+        f"\n🔍 Testing {config_name} configuration:",
+        f"   Config: {config}"
+    ]
     
     try:
         producer = Producer(config)
         
         # Try to get metadata (this will trigger the API version request)
         metadata = producer.list_topics(timeout=10)
-        print(f"   ✅ Success! Found {len(metadata.topics)} topics")
+        lines.append(f"   ✅ Success! Found {len(metadata.topics)} topics")
         
         # List some topics
         if metadata.topics:
-            print("   📋 Available topics:")
+            lines.append("   📋 Available topics:")
             for topic_name in list(metadata.topics.keys())[:5]:  # Show first 5 topics
-                print(f"      - {topic_name}")
+                lines.append(f"      - {topic_name}")
         else:
-            print("   📋 No topics found (this is normal for a fresh Kafka setup)")
+            lines.append("   📋 No topics found (this is normal for a fresh Kafka setup)")
         
         producer.close()
-        return True
+        return True, "\n".join(lines)
         
     except Exception as e:
-        print(f"   ❌ Failed: {str(e)}")
-        return False
+        lines.append(f"   ❌ Failed: {str(e)}")
+        return False, "\n".join(lines)
 
 def main():
     print("🔍 Kafka Connection Diagnostic Tool")
@@ -71,23 +103,25 @@ def main():
     host = "localhost"
     port = 9092
     
+    # Tests 1 and 2 run concurrently; results are reported in order
+    (tcp_available, tcp_error), (ssl_available, ssl_error) = asyncio.run(test_connections(host, port))
+    
     # Test 1: Basic TCP connection
     print(f"\n1️⃣ Testing basic TCP connection to {host}:{port}")
-    if test_connection(host, port):
+    if tcp_available:
         print("   ✅ TCP connection successful")
     else:
-        print("   ❌ TCP connection failed")
+        print(f"   ❌ TCP connection failed: {tcp_error}")
         print("   💡 Make sure Kafka is running and accessible on this port")
         return
     
     # Test 2: SSL connection
     print(f"\n2️⃣ Testing SSL connection to {host}:{port}")
-    if test_ssl_connection(host, port):
+    if ssl_available:
         print("   ✅ SSL connection successful")
-        ssl_available = True
     else:
-        print("   ❌ SSL connection failed (this is normal for PLAINTEXT setup)")
-        ssl_available = False
+        print(f"   ❌ SSL connection failed: {ssl_error}")
+        print("      (this is normal for PLAINTEXT setup)")
     
     # Test 3: Different Kafka configurations
     configs_to_test = [
@@ -139,9 +173,16 @@ def main():
     print(f"\n3️⃣ Testing different Kafka configurations:")
     successful_configs = []
     
-    for config_test in configs_to_test:
-        if test_kafka_config(config_test['config'], config_test['name']):
-            successful_configs.append(config_test)
+    # Each probe can block for up to 10s, so run them all in parallel
+    with ThreadPoolExecutor(max_workers=len(configs_to_test)) as executor:
+        results = executor.map(
+            lambda c: test_kafka_config(c['config'], c['name']),
+            configs_to_test
+        )
+        for config_test, (success, report) in zip(configs_to_test, results):
+            print(report)
+            if success:
+                successful_configs.append(config_test)
     
     # Results
     print(f"\n📊 Results:")
@@ -0,0 +1,14 @@
+"""
+Gunicorn configuration for the Kafka Producer API
+Picked up automatically when running `gunicorn wsgi:app` from this directory
+"""
+
+bind = '0.0.0.0:5000'
+
+# One worker process with many threads so every request shares a single
+# Kafka producer and its batches. librdkafka is thread-safe, but its background
+# threads don't survive fork(), so don't use preload_app with the module-level producer.
+workers = 1
+worker_class = 'gthread'
+threads = 32
+preload_app = False
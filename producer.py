@@ -2,21 +2,91 @@
 Kafka Producer Flask Application
 Exposes a REST API to produce messages to Kafka topics
 """
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+from pydantic import BaseModel, Field, ValidationError
 from confluent_kafka import Producer
-import json
+from confluent_kafka.schema_registry import SchemaRegistryClient
+from confluent_kafka.schema_registry.avro import AvroSerializer
+from confluent_kafka.serialization import SerializationContext, MessageField
+import orjson
+import msgpack
+import os
+import time
 import logging
-from config import get_kafka_config, get_environment
+import atexit
+from datetime import datetime
+from config import (
+    get_kafka_config, get_producer_config, get_environment,
+    get_message_format, get_schema_registry_config
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson
+    Used by jsonify() for all API responses
+    """
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Initialize Kafka producer
 kafka_config = get_kafka_config()
-producer = Producer(kafka_config)
+producer = Producer(get_producer_config())
+
+# Deliver any queued messages before the process exits
+atexit.register(lambda: producer.flush(30))
+
+# Message payload serialization
+message_format = get_message_format()
+avro_serializer = None
+if message_format == 'avro':
+    # The schema is registered with Schema Registry on first use
+    with open(os.path.join(os.path.dirname(__file__), 'message.avsc')) as schema_file:
+        avro_serializer = AvroSerializer(
+            SchemaRegistryClient(get_schema_registry_config()),
+            schema_file.read()
+        )
+
+def serialize(message_data, topic):
+    """
+    Serialize a message payload to bytes in the configured wire format
+    """
+    if avro_serializer is not None:
+        return avro_serializer(message_data, SerializationContext(topic, MessageField.VALUE))
+    if message_format == 'msgpack':
+        return msgpack.packb(message_data)
+    return orjson.dumps(message_data)
+
+# The health response never changes, so serialize it once
+HEALTH_RESPONSE = orjson.dumps({
+    'status': 'healthy',
+    'environment': get_environment(),
+    'kafka_config': kafka_config
+})
+
+# (epoch second, ISO string) for the most recent timestamp
+_timestamp_cache = (None, None)
+
+def current_timestamp():
+    """
+    Returns the current local time as an ISO 8601 string (second resolution)
+    The string is only formatted once per second and reused for every request in it
+    """
+    global _timestamp_cache
+    now = int(time.time())
+    if _timestamp_cache[0] != now:
+        _timestamp_cache = (now, datetime.fromtimestamp(now).isoformat())
+    return _timestamp_cache[1]
 
 def delivery_callback(err, msg):
     """
@@ -28,6 +98,20 @@ def delivery_callback(err, msg):
     else:
         logger.info(f'Message delivered to {msg.topic()} [{msg.partition()}] at offset {msg.offset()}')
 
+class ProduceRequest(BaseModel):
+    """
+    Query parameters for /produce
+    Both fields are required and must be non-empty
+    """
+    topic: str = Field(min_length=1)
+    msg: str = Field(min_length=1)
+
+# Error returned for the first invalid /produce parameter
+PARAMETER_ERRORS = {
+    'topic': 'Topic parameter is required',
+    'msg': 'Message parameter is required'
+}
+
 @app.route('/produce', methods=['GET'])
 def produce_message():
     """
@@ -41,51 +125,46 @@ def produce_message():
     - JSON response with success/failure status
     """
     try:
-        # Get query parameters
-        topic = request.args.get('topic')
-        message = request.args.get('msg')
-        
-        # Validate required parameters
-        if not topic:
+        # Get and validate query parameters
+        try:
+            params = ProduceRequest(topic=request.args.get('topic'), msg=request.args.get('msg'))
+        except ValidationError as e:
+            field = e.errors()[0]['loc'][0]
             return jsonify({
                 'success': False,
-                'error': 'Topic parameter is required'
-            }), 400
-            
-        if not message:
-            return jsonify({
-                'success': False,
-                'error': 'Message parameter is required'
+                'error': PARAMETER_ERRORS[field]
             }), 400
         
+        topic = params.topic
+        message = params.msg
+        
         # Create message payload
-        from datetime import datetime
         message_data = {
             'message': message,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': current_timestamp(),
             'environment': get_environment()
         }
         
-        # Convert to JSON string
-        message_json = json.dumps(message_data)
+        # Serialize to bytes (produce() accepts bytes directly)
+        message_bytes = serialize(message_data, topic)
         
         # Produce message to Kafka
         # The produce() method is asynchronous - it returns immediately
         producer.produce(
             topic=topic,
-            value=message_json,
+            value=message_bytes,
             callback=delivery_callback
         )
         
-        # Wait for any outstanding messages to be delivered
-        # This ensures the message is actually sent before responding
-        producer.flush(timeout=10)
+        # Serve delivery callbacks without blocking
+        # Delivery happens in the background so requests can be batched together
+        producer.poll(0)
         
-        logger.info(f'Successfully produced message to topic: {topic}')
+        logger.info(f'Successfully queued message for topic: {topic}')
         
         return jsonify({
             'success': True,
-            'message': 'Message produced successfully',
+            'message': 'Message queued for delivery',
             'topic': topic,
             'data': message_data
         })
@@ -102,11 +181,7 @@ def health_check():
     """
     Health check endpoint
     """
-    return jsonify({
-        'status': 'healthy',
-        'environment': get_environment(),
-        'kafka_config': kafka_config
-    })
+    return Response(HEALTH_RESPONSE, mimetype='application/json')
 
 @app.route('/', methods=['GET'])
 def index():
@@ -4,16 +4,35 @@ Test script to demonstrate Kafka producer and consumer functionality
 This script helps test the setup by sending sample messages
 """
 import requests
-import time
-import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_URL = "http://localhost:5000"
+
+# Number of requests sent to the producer API in parallel
+MAX_WORKERS = 32
+
+# Shared session so requests reuse keep-alive connections
+# The pool is sized so every worker thread can hold its own connection
+session = requests.Session()
+session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=MAX_WORKERS))
+
+def send_test_message(test_msg):
+    """
+    Send a single test message to the producer API
+    
+    Returns:
+    - (response, error) tuple; exactly one of them is None
+    """
+    try:
+        return session.get(f"{BASE_URL}/produce", params=test_msg), None
+    except Exception as e:
+        return None, e
 
 def test_producer_api():
     """
-    Test the producer API by sending sample messages
+    Test the producer API by sending sample messages concurrently
     """
-    base_url = "http://localhost:5000"
-    
     # Test messages
     test_messages = [
         {"topic": "payments", "msg": "Payment processed for order 12345"},
@@ -26,32 +45,28 @@ def test_producer_api():
     print("🧪 Testing Kafka Producer API")
     print("=" * 50)
     
-    for i, test_msg in enumerate(test_messages, 1):
-        try:
-            print(f"\n📤 Sending test message {i}/{len(test_messages)}")
-            print(f"   Topic: {test_msg['topic']}")
-            print(f"   Message: {test_msg['msg']}")
-            
-            response = requests.get(f"{base_url}/produce", params=test_msg)
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('success'):
-                    print("   ✅ Success!")
-                else:
-                    print(f"   ❌ Failed: {result.get('error')}")
-            else:
-                print(f"   ❌ HTTP Error: {response.status_code}")
-                print(f"   Response: {response.text}")
-                
-        except requests.exceptions.ConnectionError:
-            print("   ❌ Connection Error: Make sure the producer is running on port 5000")
-            break
-        except Exception as e:
-            print(f"   ❌ Error: {str(e)}")
+    # Send all messages at once; results come back in the original order
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(send_test_message, test_messages))
+    
+    for i, (test_msg, (response, error)) in enumerate(zip(test_messages, results), 1):
+        print(f"\n📤 Sent test message {i}/{len(test_messages)}")
+        print(f"   Topic: {test_msg['topic']}")
+        print(f"   Message: {test_msg['msg']}")
         
-        # Small delay between messages
-        time.sleep(0.5)
+        if isinstance(error, requests.exceptions.ConnectionError):
+            print("   ❌ Connection Error: Make sure the producer is running on port 5000")
+        elif error is not None:
+            print(f"   ❌ Error: {str(error)}")
+        elif response.status_code == 200:
+            result = response.json()
+            if result.get('success'):
+                print("   ✅ Success!")
+            else:
+                print(f"   ❌ Failed: {result.get('error')}")
+        else:
+            print(f"   ❌ HTTP Error: {response.status_code}")
+            print(f"   Response: {response.text}")
     
     print("\n" + "=" * 50)
     print("🏁 Test completed!")
@@ -61,7 +76,7 @@ def check_producer_health():
     Check if the producer API is running and healthy
     """
     try:
-        response = requests.get("http://localhost:5000/health", timeout=5)
+        response = session.get(f"{BASE_URL}/health", timeout=5)
         if response.status_code == 200:
             health_data = response.json()
             print("✅ Producer API is healthy")
@@ -96,9 +111,9 @@ def main():
     test_producer_api()
     
     print("\n💡 To consume messages, run:")
-    print("   python consumer.py payments")
-    print("   python consumer.py orders")
-    print("   python consumer.py logs")
+    print("   python consumer.py payments --verbose")
+    print("   python consumer.py orders --verbose")
+    print("   python consumer.py logs --verbose")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,12 @@
+"""
+WSGI entry point for the Kafka Producer API
+Run with a production server instead of the Flask dev server:
+
+    gunicorn wsgi:app
+
+Worker settings live in gunicorn.conf.py
+"""
+from producer import app
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=5000)